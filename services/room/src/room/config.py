@@ -9,10 +9,25 @@ from pydantic import BaseModel, Field
 
 class ServerConfig(BaseModel):
     grpc_port: int = Field(50052, description="gRPC server port")
+    use_uvloop: bool = Field(
+        True, description="Run on uvloop when installed (disable for debugging)"
+    )
+    shutdown_grace_seconds: float = Field(
+        10.0, description="Time allowed for in-flight streams to finish on shutdown"
+    )
+    allow_python_protobuf: bool = Field(
+        False, description="Start even if protobuf falls back to its pure-Python backend"
+    )
 
 
 class ChatServiceConfig(BaseModel):
     address: str = Field("localhost:50051", description="Chat service gRPC address")
+    chunk_flush_interval_ms: float = Field(
+        10.0, description="Coalesce streamed LLM tokens for up to this long (0 disables)"
+    )
+    chunk_flush_chars: int = Field(
+        64, description="Flush coalesced LLM tokens early once this many chars are buffered"
+    )
 
 
 class AppConfig(BaseModel):
@@ -9,8 +9,8 @@ import asyncio
 import json
 import logging
 import re
-import uuid
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional
 
 import grpc
@@ -19,6 +19,8 @@ from pb.api.chat import chat_pb2, chat_pb2_grpc
 from pb.api.room import room_pb2
 from pb.shared import content_pb2
 
+from room.store import new_message_id
+
 if TYPE_CHECKING:
     from room.registry import HandlerRegistry
     from room.store import MemoryStore, StoredRoom, StoredMessage
@@ -29,6 +31,9 @@ logger = logging.getLogger(__name__)
 _MENTION_RE = re.compile(r"@([\w\u4e00-\u9fff-]+)")
 _MENTION_ALL_RE = re.compile(r"(?<![\w\u4e00-\u9fff])@(all|everyone)(?![\w\u4e00-\u9fff])", re.IGNORECASE)
 
+# Plain int for hot-loop comparisons (skips the room_pb2 attribute lookup)
+_SENDER_LLM: int = room_pb2.LLM
+
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -57,25 +62,39 @@ def strip_self_name_prefix(text: str, display_name: str) -> str:
     return cleaned.lstrip()
 
 
+_CHAT_STYLE_MODIFIERS = {
+    room_pb2.CHAT_STYLE_CONVERSATIONAL: (
+        "RESPONSE STYLE: Keep responses brief - 1-2 sentences max. "
+        "Think of this as Slack chat, not email. Be punchy and conversational."
+    ),
+    room_pb2.CHAT_STYLE_DETAILED: (
+        "RESPONSE STYLE: Provide thorough, well-structured responses. "
+        "Take time to explain your reasoning fully."
+    ),
+    room_pb2.CHAT_STYLE_BULLET: (
+        "RESPONSE STYLE: Use bullet points. Be concise and scannable. "
+        "Structure your response as a list."
+    ),
+}
+
+
 def get_chat_style_modifier(chat_style: int) -> str:
     """Return system prompt modifier based on chat style."""
-    CONVERSATIONAL, DETAILED, BULLET = 1, 2, 3
+    return _CHAT_STYLE_MODIFIERS.get(chat_style, "")
 
-    modifiers = {
-        CONVERSATIONAL: (
-            "RESPONSE STYLE: Keep responses brief - 1-2 sentences max. "
-            "Think of this as Slack chat, not email. Be punchy and conversational."
-        ),
-        DETAILED: (
-            "RESPONSE STYLE: Provide thorough, well-structured responses. "
-            "Take time to explain your reasoning fully."
-        ),
-        BULLET: (
-            "RESPONSE STYLE: Use bullet points. Be concise and scannable. "
-            "Structure your response as a list."
-        ),
-    }
-    return modifiers.get(chat_style, "")
+
+@lru_cache(maxsize=1024)
+def _system_message(prompt: str) -> content_pb2.Message:
+    """Build (once per distinct prompt) the SYSTEM message for a chat request.
+
+    The prompt only changes when the persona, room or roster does, so repeat
+    calls reuse the same proto. Treat the result as read-only: ChatRequest
+    copies it on construction.
+    """
+    return content_pb2.Message(
+        role=content_pb2.SYSTEM,
+        contents=[content_pb2.Content(text=prompt)],
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -129,7 +148,7 @@ def build_poll_tools(poll_id: str, question: str, options: list, mandatory: bool
 
 def build_room_tools(room: "StoredRoom", active_polls: list = None) -> list[chat_pb2.ToolDefinition]:
     """Build the tool definitions for LLM interaction."""
-    llm_names = [llm.display_name for llm in room.llms]
+    llm_names = [llm.display_name for llm in room.llms.values()]
 
     tools = [
         chat_pb2.ToolDefinition(
@@ -205,7 +224,7 @@ async def build_system_prompt(
     """Build a rich system prompt with room context for the LLM."""
     my_name = llm_config.display_name
     room_name = room.name if room else "Unknown Room"
-    other_llms = [llm.display_name for llm in room.llms if llm.id != llm_config.id]
+    other_llms = [llm.display_name for llm in room.llms.values() if llm.id != llm_config.id]
 
     parts = []
 
@@ -265,15 +284,58 @@ async def build_system_prompt(
 # ---------------------------------------------------------------------------
 
 
+def _get_llm_name_lookup(room: "StoredRoom") -> dict[str, room_pb2.LLMConfig]:
+    """Lowercased display name (and its snake_case form) → LLM, cached on the room."""
+    if room.llm_name_lookup is None:
+        # On collision snake_case forms win over plain names, and later LLMs
+        # over earlier ones, as when these dicts were rebuilt per message
+        lookup = {llm.display_name.lower(): llm for llm in room.llms.values()}
+        lookup.update(
+            {llm.display_name.lower().replace(" ", "_"): llm for llm in room.llms.values()}
+        )
+        room.llm_name_lookup = lookup
+    return room.llm_name_lookup
+
+
+def _get_llm_lookup(room: "StoredRoom") -> dict[str, room_pb2.LLMConfig]:
+    """Like _get_llm_name_lookup, but LLM ids match too. Cached on the room."""
+    if room.llm_lookup is None:
+        # Names win over ids on collision
+        lookup = {llm_id.lower(): llm for llm_id, llm in room.llms.items()}
+        lookup.update(_get_llm_name_lookup(room))
+        room.llm_lookup = lookup
+    return room.llm_lookup
+
+
+def _get_mention_re(room: "StoredRoom") -> re.Pattern[str]:
+    """One alternation of every name the room's LLMs answer to, cached on the room.
+
+    Scanning content once for known names replaces tokenizing every @word
+    and looking each up. Longest names go first so "@claude-2" is not cut
+    short at "@claude"; @all/@everyone ride along for the broadcast check.
+    """
+    if room.mention_re is None:
+        names = {name for name in _get_llm_lookup(room) if name}
+        names.update(("all", "everyone"))
+        alternation = "|".join(
+            re.escape(name) for name in sorted(names, key=len, reverse=True)
+        )
+        room.mention_re = re.compile(
+            rf"@({alternation})(?![\w\u4e00-\u9fff-])", re.IGNORECASE
+        )
+    return room.mention_re
+
+
 def match_llms_from_mentions(
     content: str,
     client_mentions: list[str],
     room: "StoredRoom",
 ) -> list[room_pb2.LLMConfig]:
     """Parse @mentions and return matched LLM configs."""
-    normalized_mentions = {
-        normalize_mention(m) for m in (set(client_mentions) | set(_MENTION_RE.findall(content)))
-    }
+    normalized_mentions = {normalize_mention(m) for m in client_mentions}
+    normalized_mentions.update(
+        match.group(1).lower() for match in _get_mention_re(room).finditer(content)
+    )
     normalized_mentions.discard("")
 
     # Check for @all / @everyone
@@ -281,15 +343,9 @@ def match_llms_from_mentions(
         m in {"all", "everyone"} for m in normalized_mentions
     )
     if has_mention_all:
-        return list(room.llms)
+        return list(room.llms.values())
 
-    llm_lookup = {
-        llm.id.lower(): llm for llm in room.llms
-    } | {
-        llm.display_name.lower(): llm for llm in room.llms
-    } | {
-        llm.display_name.lower().replace(" ", "_"): llm for llm in room.llms
-    }
+    llm_lookup = _get_llm_lookup(room)
 
     matched_llms = []
     for mention in normalized_mentions:
@@ -306,11 +362,7 @@ def match_llm_from_name(
     exclude_llm_id: Optional[str] = None,
 ) -> Optional[room_pb2.LLMConfig]:
     """Match an LLM by display name (case-insensitive)."""
-    llm_lookup = {
-        llm.display_name.lower(): llm for llm in room.llms
-    } | {
-        llm.display_name.lower().replace(" ", "_"): llm for llm in room.llms
-    }
+    llm_lookup = _get_llm_name_lookup(room)
 
     normalized = name.lower().strip()
     llm = llm_lookup.get(normalized)
@@ -324,6 +376,16 @@ def match_llm_from_name(
 # ---------------------------------------------------------------------------
 
 
+@dataclass
+class SharedContext:
+    """Room state loaded once per trigger and shared by every LLM answering it."""
+    room: "StoredRoom"
+    online_humans: list[str]
+    recent_messages: list["StoredMessage"]
+    # None when the caller supplies its own tools (poll voting)
+    room_tools: Optional[list[chat_pb2.ToolDefinition]]
+
+
 @dataclass
 class LLMCallContext:
     """Shared context for LLM calls."""
@@ -343,20 +405,32 @@ class LLMCallContext:
 
 
 class LLMDispatcher:
-    """Handles LLM calls and streaming responses."""
+    """Handles LLM calls and streaming responses.
+
+    One instance is shared by every session, so tasks are tracked per room
+    and an interrupt from any participant reaches the running LLM call.
+    """
 
     def __init__(
         self,
-        chat_service_address: str,
+        chat_channel: grpc.aio.Channel,
         store: "MemoryStore",
         registry: "HandlerRegistry",
+        chunk_flush_interval: float = 0.01,
+        chunk_flush_chars: int = 64,
     ) -> None:
-        self._chat_address = chat_service_address
+        # Stubs are cheap but stateless, so one per process is enough
+        self._chat_stub = chat_pb2_grpc.ChatStub(chat_channel)
         self._store = store
         self._registry = registry
-        self._pending_tasks: set[asyncio.Task] = set()
-        # Track active tasks by llm_id for interrupt support
-        self._active_llm_tasks: dict[str, asyncio.Task] = {}
+        # Streamed tokens are coalesced into one llm_chunk broadcast until
+        # either bound is hit, so fast streams don't fan out per token
+        self._chunk_flush_interval = chunk_flush_interval
+        self._chunk_flush_chars = chunk_flush_chars
+        # room_id → in-flight tasks, for cleanup when a room empties
+        self._room_tasks: dict[str, set[asyncio.Task]] = {}
+        # Track active tasks by (room_id, llm_id) for interrupt support
+        self._active_llm_tasks: dict[tuple[str, str], asyncio.Task] = {}
 
     # -----------------------------------------------------------------------
     # Public dispatch methods
@@ -372,6 +446,11 @@ class LLMDispatcher:
     ) -> None:
         """Parse @mentions and fire off LLM requests for matched LLMs."""
         matched_llms = match_llms_from_mentions(content, client_mentions, room)
+        if not matched_llms:
+            return
+        shared = await self._load_shared_context(room_id)
+        if not shared:
+            return
         for llm_config in matched_llms:
             logger.info(
                 "LLM mention dispatch: room=%s, target=%s (%s), trigger_msg=%s, mention_type=text",
@@ -380,8 +459,8 @@ class LLMDispatcher:
                 llm_config.display_name,
                 trigger_msg_id,
             )
-            task = asyncio.create_task(self.call_llm(room_id, llm_config, trigger_msg_id))
-            self._track_task(task, llm_config.id)
+            task = asyncio.create_task(self.call_llm(room_id, llm_config, trigger_msg_id, shared))
+            self._track_task(task, room_id, llm_config.id)
 
     async def dispatch_llm_mentions(
         self,
@@ -392,9 +471,14 @@ class LLMDispatcher:
         source_llm_id: str,
     ) -> None:
         """Dispatch mentions from one LLM to trigger other LLMs."""
+        shared: Optional[SharedContext] = None
         for mention in mentions:
             llm = match_llm_from_name(mention, room, exclude_llm_id=source_llm_id)
             if llm:
+                if shared is None:
+                    shared = await self._load_shared_context(room_id)
+                    if not shared:
+                        return
                 logger.info(
                     "LLM mention dispatch: room=%s, source=%s, target=%s (%s), trigger_msg=%s, mention_type=tool",
                     room_id,
@@ -403,8 +487,8 @@ class LLMDispatcher:
                     llm.display_name,
                     trigger_msg_id,
                 )
-                task = asyncio.create_task(self.call_llm(room_id, llm, trigger_msg_id))
-                self._track_task(task, llm.id)
+                task = asyncio.create_task(self.call_llm(room_id, llm, trigger_msg_id, shared))
+                self._track_task(task, room_id, llm.id)
 
     async def dispatch_poll_voting(
         self,
@@ -419,26 +503,28 @@ class LLMDispatcher:
         room = await self._store.get_room(room_id)
         if not room or not room.llms:
             return
+        shared = await self._load_shared_context(room_id, room_tools=False)
+        if not shared:
+            return
 
-        for llm_config in room.llms:
+        for llm_config in room.llms.values():
             task = asyncio.create_task(
-                self.call_llm_for_poll(room_id, llm_config, poll_id, question, options, mandatory, trigger_msg_id)
+                self.call_llm_for_poll(
+                    room_id, llm_config, poll_id, question, options, mandatory, trigger_msg_id, shared
+                )
             )
-            self._track_task(task, llm_config.id)
+            self._track_task(task, room_id, llm_config.id)
 
     # -----------------------------------------------------------------------
     # Private: Context building
     # -----------------------------------------------------------------------
 
-    async def _build_context(
+    async def _load_shared_context(
         self,
         room_id: str,
-        llm_config: room_pb2.LLMConfig,
-        trigger_msg_id: str,
-        extra_system_instruction: str = "",
-        custom_tools: list[chat_pb2.ToolDefinition] | None = None,
-    ) -> Optional[LLMCallContext]:
-        """Build common context for an LLM call."""
+        room_tools: bool = True,
+    ) -> Optional[SharedContext]:
+        """Load the LLM-independent part of a call context."""
         room = await self._store.get_room(room_id)
         if not room:
             return None
@@ -451,23 +537,50 @@ class LLMDispatcher:
         # Load message history
         recent_msgs, _ = await self._store.load_history(room_id, limit=50)
 
-        # Build system prompt
-        system_prompt = await build_system_prompt(llm_config, room, online_humans, extra_system_instruction)
-
         # Build tools
-        if custom_tools is not None:
-            tools = custom_tools
-        else:
+        tools = None
+        if room_tools:
             active_polls = await self._store.list_room_polls(room_id, active_only=True)
             tools = build_room_tools(room, active_polls=[self._store.poll_to_proto(p) for p in active_polls])
 
+        return SharedContext(
+            room=room,
+            online_humans=online_humans,
+            recent_messages=recent_msgs,
+            room_tools=tools,
+        )
+
+    async def _build_context(
+        self,
+        room_id: str,
+        llm_config: room_pb2.LLMConfig,
+        trigger_msg_id: str,
+        extra_system_instruction: str = "",
+        custom_tools: list[chat_pb2.ToolDefinition] | None = None,
+        shared: Optional[SharedContext] = None,
+    ) -> Optional[LLMCallContext]:
+        """Build common context for an LLM call, reusing `shared` when given."""
+        if shared is None:
+            shared = await self._load_shared_context(room_id, room_tools=custom_tools is None)
+            if not shared:
+                return None
+
+        tools = custom_tools if custom_tools is not None else shared.room_tools
+        if tools is None:
+            raise ValueError("shared context was loaded without room tools")
+
+        # Build system prompt
+        system_prompt = await build_system_prompt(
+            llm_config, shared.room, shared.online_humans, extra_system_instruction
+        )
+
         return LLMCallContext(
             room_id=room_id,
             llm_config=llm_config,
             trigger_msg_id=trigger_msg_id,
-            room=room,
-            online_humans=online_humans,
-            recent_messages=recent_msgs,
+            room=shared.room,
+            online_humans=shared.online_humans,
+            recent_messages=shared.recent_messages,
             tools=tools,
             system_prompt=system_prompt,
         )
@@ -478,26 +591,25 @@ class LLMDispatcher:
     ) -> list[content_pb2.Message]:
         """Format message history for the Chat service."""
         llm_id = ctx.llm_config.id
-        messages = [
-            content_pb2.Message(
-                role=content_pb2.SYSTEM,
-                contents=[content_pb2.Content(text=ctx.system_prompt)],
-            )
-        ]
+        llm_type = _SENDER_LLM
+        messages = [_system_message(ctx.system_prompt)]
 
         for msg in ctx.recent_messages:
-            if msg.sender_type == room_pb2.LLM and msg.sender_id == llm_id:
-                role = content_pb2.ASSISTANT
-                text = msg.content
+            # The id test is the selective one, so it goes first
+            if msg.sender_id == llm_id and msg.sender_type == llm_type:
+                if msg.chat_reply is None:
+                    msg.chat_reply = content_pb2.Message(
+                        role=content_pb2.ASSISTANT,
+                        contents=[content_pb2.Content(text=msg.content)],
+                    )
+                messages.append(msg.chat_reply)
             else:
-                role = content_pb2.USER
-                text = f"{msg.sender_name}: {msg.content}"
-            messages.append(
-                content_pb2.Message(
-                    role=role,
-                    contents=[content_pb2.Content(text=text)],
-                )
-            )
+                if msg.chat_message is None:
+                    msg.chat_message = content_pb2.Message(
+                        role=content_pb2.USER,
+                        contents=[content_pb2.Content(text=f"{msg.sender_name}: {msg.content}")],
+                    )
+                messages.append(msg.chat_message)
 
         return messages
 
@@ -518,21 +630,27 @@ class LLMDispatcher:
         self, room_id: str, msg_id: str, llm_id: str, content: str, reply_to: str
     ) -> None:
         """Broadcast LLM chunk event."""
-        await self._registry.broadcast(
-            room_id,
-            room_pb2.ServerEvent(
-                llm_chunk=room_pb2.LLMChunk(
-                    message_id=msg_id, llm_id=llm_id, content=content, reply_to=reply_to
-                )
-            ),
-        )
+        await self._registry.broadcast(room_id, self._chunk_event(msg_id, llm_id, content, reply_to))
+
+    @staticmethod
+    def _chunk_event(msg_id: str, llm_id: str, content: str, reply_to: str) -> room_pb2.ServerEvent:
+        """Build an llm_chunk event."""
+        # Set fields in place; this runs once per streamed token batch
+        event = room_pb2.ServerEvent()
+        llm_chunk = event.llm_chunk
+        llm_chunk.message_id = msg_id
+        llm_chunk.llm_id = llm_id
+        llm_chunk.content = content
+        llm_chunk.reply_to = reply_to
+        return event
 
     async def _broadcast_done(self, room_id: str, msg_id: str, llm_id: str) -> None:
         """Broadcast LLM done event."""
-        await self._registry.broadcast(
-            room_id,
-            room_pb2.ServerEvent(llm_done=room_pb2.LLMDone(message_id=msg_id, llm_id=llm_id)),
-        )
+        event = room_pb2.ServerEvent()
+        llm_done = event.llm_done
+        llm_done.message_id = msg_id
+        llm_done.llm_id = llm_id
+        await self._registry.broadcast(room_id, event)
 
     async def _broadcast_error(self, room_id: str, llm_name: str, error: str) -> None:
         """Broadcast error event."""
@@ -568,31 +686,27 @@ class LLMDispatcher:
             logger.warning("Invalid vote from %s: poll_id=%r, option_ids=%r", llm_config.id, poll_id, option_ids)
             return False
 
-        voted = False
-        for option_id in option_ids:
-            result = await self._store.add_vote(
-                poll_id=poll_id,
-                option_id=option_id,
-                voter_id=llm_config.id,
-                voter_name=llm_config.display_name,
-                reason=reason,
+        results = await self._store.add_votes(
+            poll_id=poll_id,
+            option_ids=option_ids,
+            voter_id=llm_config.id,
+            voter_name=llm_config.display_name,
+            reason=reason,
+        )
+        for poll, option, stored_vote in results:
+            await self._registry.broadcast(
+                room_id,
+                room_pb2.ServerEvent(
+                    poll_voted=room_pb2.PollVoted(
+                        poll_id=poll.poll_id,
+                        option_id=option.id,
+                        vote=self._store.poll_vote_to_proto(stored_vote),
+                    )
+                ),
             )
-            if result:
-                poll, option, stored_vote = result
-                await self._registry.broadcast(
-                    room_id,
-                    room_pb2.ServerEvent(
-                        poll_voted=room_pb2.PollVoted(
-                            poll_id=poll.poll_id,
-                            option_id=option.id,
-                            vote=self._store.poll_vote_to_proto(stored_vote),
-                        )
-                    ),
-                )
-                voted = True
-                logger.info("LLM %s voted on poll %s option %s", llm_config.id, poll_id, option_id)
+            logger.info("LLM %s voted on poll %s option %s", llm_config.id, poll_id, option.id)
 
-        return voted
+        return bool(results)
 
     def _extract_mention_from_tool_call(self, arguments: str) -> Optional[str]:
         """Extract participant name from mention tool call."""
@@ -611,25 +725,45 @@ class LLMDispatcher:
         room_id: str,
         llm_config: room_pb2.LLMConfig,
         trigger_msg_id: str,
+        shared: Optional[SharedContext] = None,
     ) -> None:
         """Call the Chat Service for an LLM response and stream chunks back."""
         llm_id = llm_config.id
-        ctx = await self._build_context(room_id, llm_config, trigger_msg_id)
+        ctx = await self._build_context(room_id, llm_config, trigger_msg_id, shared=shared)
         if not ctx:
             return
 
         await self._broadcast_thinking(room_id, llm_id, trigger_msg_id)
 
         chat_messages = self._format_message_history(ctx)
-        response_msg_id = uuid.uuid4().hex[:16]
+        response_msg_id = new_message_id()
         full_content: list[str] = []
         opted_out = False
         pending_mentions: list[str] = []
+        # Tokens received but not yet broadcast. The first one goes out at once;
+        # later ones wait for chunk_flush_chars or a timer armed by the first
+        # held token, so a pause upstream can't hold received text back.
+        unsent: list[str] = []
+        unsent_len = 0
+        flush_timer: Optional[asyncio.TimerHandle] = None
+        loop = asyncio.get_running_loop()
+
+        def flush() -> None:
+            nonlocal unsent_len, flush_timer
+            if flush_timer is not None:
+                flush_timer.cancel()
+                flush_timer = None
+            if not unsent:
+                return
+            # Keep the flushed batch, not each token, for the final join
+            batch = "".join(unsent)
+            full_content.append(batch)
+            unsent.clear()
+            unsent_len = 0
+            event = self._chunk_event(response_msg_id, llm_id, batch, trigger_msg_id)
+            self._registry.broadcast_nowait(room_id, event)
 
         try:
-            channel = grpc.aio.insecure_channel(self._chat_address)
-            stub = chat_pb2_grpc.ChatStub(channel)
-
             request = chat_pb2.ChatRequest(
                 messages=chat_messages,
                 models=[llm_config.model],
@@ -637,7 +771,7 @@ class LLMDispatcher:
                 max_tokens=1500,  # Cost control: limit response length
             )
 
-            async for response in stub.Chat(request):
+            async for response in self._chat_stub.Chat(request):
                 # Log non-content responses
                 if response.delta.tool_calls or response.delta.opted_out or not response.delta.content:
                     logger.info(
@@ -674,14 +808,25 @@ class LLMDispatcher:
                 # Stream content chunks
                 chunk = response.delta.content
                 if chunk:
-                    full_content.append(chunk)
-                    await self._broadcast_chunk(room_id, response_msg_id, llm_id, chunk, trigger_msg_id)
-
-            await channel.close()
+                    unsent.append(chunk)
+                    unsent_len += len(chunk)
+                    if (
+                        not full_content
+                        or unsent_len >= self._chunk_flush_chars
+                        or self._chunk_flush_interval <= 0
+                    ):
+                        flush()
+                    elif flush_timer is None:
+                        flush_timer = loop.call_later(self._chunk_flush_interval, flush)
+
+            flush()
         except asyncio.CancelledError:
             logger.info("LLM call cancelled for %s", llm_id)
+            # Clients already saw the earlier chunks; send what's held too
+            flush()
             raise
         except grpc.RpcError as e:
+            flush()
             logger.error("Chat service error for %s: %s", llm_id, e)
             await self._broadcast_error(room_id, llm_config.display_name, str(e.details() if hasattr(e, 'details') else e))
             return
@@ -708,11 +853,12 @@ class LLMDispatcher:
             await self._broadcast_done(room_id, response_msg_id, llm_id)
 
             # Parse text @mentions as fallback
-            text_mentions = _MENTION_RE.findall(final_content)
-            for mention in text_mentions:
-                normalized = normalize_mention(mention)
-                if normalized and normalized not in [m.lower() for m in pending_mentions]:
+            seen = {m.lower() for m in pending_mentions}
+            for match in _MENTION_RE.finditer(final_content):
+                normalized = normalize_mention(match.group(1))
+                if normalized and normalized not in seen:
                     pending_mentions.append(normalized)
+                    seen.add(normalized)
                     logger.info("LLM %s text-mentioned %s", llm_id, normalized)
 
             # Dispatch mentions
@@ -736,6 +882,7 @@ class LLMDispatcher:
         options: list[dict],
         mandatory: bool,
         trigger_msg_id: str,
+        shared: Optional[SharedContext] = None,
     ) -> None:
         """Call an LLM specifically to vote on a poll."""
         llm_id = llm_config.id
@@ -759,6 +906,7 @@ class LLMDispatcher:
             room_id, llm_config, trigger_msg_id,
             extra_system_instruction=poll_instruction,
             custom_tools=poll_tools,
+            shared=shared,
         )
         if not ctx:
             return
@@ -766,14 +914,11 @@ class LLMDispatcher:
         await self._broadcast_thinking(room_id, llm_id, trigger_msg_id)
 
         chat_messages = self._format_message_history(ctx)
-        response_msg_id = uuid.uuid4().hex[:16]
+        response_msg_id = new_message_id()
         full_content: list[str] = []
         voted = False
 
         try:
-            channel = grpc.aio.insecure_channel(self._chat_address)
-            stub = chat_pb2_grpc.ChatStub(channel)
-
             request = chat_pb2.ChatRequest(
                 messages=chat_messages,
                 models=[llm_config.model],
@@ -781,7 +926,7 @@ class LLMDispatcher:
                 max_tokens=500,  # Cost control: polls need less output
             )
 
-            async for response in stub.Chat(request):
+            async for response in self._chat_stub.Chat(request):
                 if response.delta.tool_calls:
                     logger.info("LLM %s poll tool calls: %s", llm_id, [tc.name for tc in response.delta.tool_calls])
 
@@ -796,8 +941,6 @@ class LLMDispatcher:
                 if chunk:
                     full_content.append(chunk)
                     await self._broadcast_chunk(room_id, response_msg_id, llm_id, chunk, trigger_msg_id)
-
-            await channel.close()
         except asyncio.CancelledError:
             raise
         except grpc.RpcError as e:
@@ -828,22 +971,33 @@ class LLMDispatcher:
     # Task tracking
     # -----------------------------------------------------------------------
 
-    def _track_task(self, task: asyncio.Task, llm_id: Optional[str] = None) -> None:
+    def _track_task(
+        self, task: asyncio.Task, room_id: str, llm_id: Optional[str] = None
+    ) -> None:
         """Track a fire-and-forget task for cleanup.
 
-        If llm_id is provided, the task is also tracked by LLM ID for interrupt support.
+        If llm_id is provided, the task is also tracked by (room_id, llm_id)
+        for interrupt support.
         """
-        self._pending_tasks.add(task)
-        task.add_done_callback(self._pending_tasks.discard)
+        room_tasks = self._room_tasks.setdefault(room_id, set())
+        room_tasks.add(task)
+
+        def _untrack(t: asyncio.Task) -> None:
+            room_tasks.discard(t)
+            if not room_tasks and self._room_tasks.get(room_id) is room_tasks:
+                del self._room_tasks[room_id]
+
+        task.add_done_callback(_untrack)
 
         if llm_id:
             # Track by LLM ID for interrupt support
-            self._active_llm_tasks[llm_id] = task
+            key = (room_id, llm_id)
+            self._active_llm_tasks[key] = task
 
             def _remove_llm_task(t: asyncio.Task) -> None:
                 # Only remove if this task is still the tracked one
-                if self._active_llm_tasks.get(llm_id) is t:
-                    del self._active_llm_tasks[llm_id]
+                if self._active_llm_tasks.get(key) is t:
+                    del self._active_llm_tasks[key]
 
             task.add_done_callback(_remove_llm_task)
 
@@ -852,7 +1006,7 @@ class LLMDispatcher:
 
         Returns True if a task was cancelled, False if no task was active.
         """
-        task = self._active_llm_tasks.get(llm_id)
+        task = self._active_llm_tasks.get((room_id, llm_id))
         if not task or task.done():
             logger.info("No active task to cancel for LLM %s", llm_id)
             return False
@@ -875,10 +1029,28 @@ class LLMDispatcher:
 
         return True
 
-    async def cancel_pending_tasks(self) -> None:
-        """Cancel all pending LLM tasks (e.g., on cleanup)."""
-        for task in list(self._pending_tasks):
+    async def wait_idle(self, timeout: float) -> None:
+        """Wait up to `timeout` seconds for in-flight LLM tasks to finish.
+
+        Re-checks after each wave, since a reply can @mention another LLM.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while tasks := set().union(*self._room_tasks.values()):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.wait(tasks, timeout=remaining)
+
+    async def cancel_room_tasks(self, room_id: str) -> None:
+        """Cancel all pending LLM tasks for a room (e.g., when it empties)."""
+        tasks = list(self._room_tasks.pop(room_id, ()))
+        for task in tasks:
             task.cancel()
-        if self._pending_tasks:
-            await asyncio.gather(*self._pending_tasks, return_exceptions=True)
-        self._pending_tasks.clear()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def cancel_pending_tasks(self) -> None:
+        """Cancel all pending LLM tasks in every room (e.g., on shutdown)."""
+        for room_id in list(self._room_tasks):
+            await self.cancel_room_tasks(room_id)
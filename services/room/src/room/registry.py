@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AbstractSet, Optional, Union
 
 from pb.api.room import room_pb2
 
@@ -19,44 +19,90 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class CachedEvent:
+    """A ServerEvent shared by every recipient of a broadcast.
+
+    gRPC serializes each write separately, so fanning one event out to N
+    streams would encode the same bytes N times. Wrapping it here means
+    the first write pays for SerializeToString and the rest reuse it.
+    """
+
+    __slots__ = ("event", "_bytes")
+
+    def __init__(self, event: room_pb2.ServerEvent) -> None:
+        self.event = event
+        self._bytes: Optional[bytes] = None
+
+    def SerializeToString(self) -> bytes:
+        if self._bytes is None:
+            self._bytes = self.event.SerializeToString()
+        return self._bytes
+
+
+OutboundEvent = Union[room_pb2.ServerEvent, CachedEvent]
+
+_NO_USERS: AbstractSet[str] = frozenset()
+
+
+def serialize_event(event: OutboundEvent) -> bytes:
+    """Response serializer for RoomSession; accepts raw or cached events."""
+    return event.SerializeToString()
+
+
 class HandlerRegistry:
     def __init__(self) -> None:
-        self._handlers: dict[str, set[StreamHandler]] = defaultdict(set)
+        # room_id → user_id → handler. A user holds at most one handler per
+        # room (reconnects evict the old one), so keying by user_id makes
+        # exclusion and online lookups direct dict operations.
+        self._handlers: dict[str, dict[str, StreamHandler]] = defaultdict(dict)
 
-    def register(self, room_id: str, handler: StreamHandler) -> None:
-        # Remove any stale handlers for the same user (reconnection case)
-        stale = [h for h in self._handlers[room_id] if h.user_id == handler.user_id]
-        for h in stale:
-            self._handlers[room_id].discard(h)
+    def register(self, room_id: str, user_id: str, handler: StreamHandler) -> None:
+        # Remove any stale handler for the same user (reconnection case)
+        handlers = self._handlers[room_id]
+        stale = handlers.get(user_id)
+        if stale is not None and stale is not handler:
             logger.info(
                 "Evicted stale handler for user %s in room %s",
-                h.user_id,
+                stale.user_id,
                 room_id,
             )
 
-        self._handlers[room_id].add(handler)
+        handlers[user_id] = handler
         logger.info(
             "Registered handler for user %s in room %s (total: %d)",
-            handler.user_id,
+            user_id,
             room_id,
-            len(self._handlers[room_id]),
+            len(handlers),
         )
 
-    def unregister(self, room_id: str, handler: StreamHandler) -> None:
-        self._handlers[room_id].discard(handler)
-        if not self._handlers[room_id]:
+    def unregister(self, room_id: str, user_id: str, handler: StreamHandler) -> None:
+        handlers = self._handlers.get(room_id)
+        if handlers is None:
+            return
+        # An evicted handler must not remove the one that replaced it
+        if handlers.get(user_id) is handler:
+            del handlers[user_id]
+        if not handlers:
             del self._handlers[room_id]
         logger.info(
             "Unregistered handler for user %s in room %s",
-            handler.user_id,
+            user_id,
             room_id,
         )
 
     async def broadcast(self, room_id: str, event: room_pb2.ServerEvent) -> None:
         """Send an event to all handlers in a room."""
-        handlers = list(self._handlers.get(room_id, set()))
-        for handler in handlers:
-            await handler.enqueue(event)
+        self.broadcast_nowait(room_id, event)
+
+    def broadcast_nowait(self, room_id: str, event: room_pb2.ServerEvent) -> None:
+        """Like broadcast(), but callable from plain loop callbacks."""
+        handlers = self._handlers.get(room_id)
+        if not handlers:
+            return
+        shared = CachedEvent(event)
+        # enqueue_nowait never yields, so the dict can't change mid-loop
+        for handler in handlers.values():
+            handler.enqueue_nowait(shared)
 
     async def broadcast_except(
         self,
@@ -65,10 +111,28 @@ class HandlerRegistry:
         exclude_user_id: str,
     ) -> None:
         """Send an event to all handlers except the specified user."""
-        handlers = list(self._handlers.get(room_id, set()))
-        for handler in handlers:
-            if handler.user_id != exclude_user_id:
-                await handler.enqueue(event)
+        room_handlers = self._handlers.get(room_id)
+        if not room_handlers:
+            return
+        # Solo room: the only listener is the sender (typing, joins)
+        if len(room_handlers) == 1 and exclude_user_id in room_handlers:
+            return
+        shared = CachedEvent(event)
+        for user_id, handler in room_handlers.items():
+            if user_id != exclude_user_id:
+                handler.enqueue_nowait(shared)
+
+    def close_all(self) -> None:
+        """Ask every registered handler to flush and end its stream."""
+        for handlers in self._handlers.values():
+            for handler in handlers.values():
+                handler.close()
+
+    def get_online_user_ids(self, room_id: str) -> AbstractSet[str]:
+        """Live read-only view of user_ids with a handler in the room.
 
-    def get_online_user_ids(self, room_id: str) -> set[str]:
-        return {h.user_id for h in self._handlers.get(room_id, set())}
+        The view tracks register/unregister without being rebuilt, so use it
+        for membership checks; copy it if you need a snapshot across awaits.
+        """
+        handlers = self._handlers.get(room_id)
+        return handlers.keys() if handlers is not None else _NO_USERS
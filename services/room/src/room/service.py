@@ -9,18 +9,64 @@ import grpc
 from pb.api.room import room_pb2, room_pb2_grpc
 
 from room.config import AppConfig
-from room.registry import HandlerRegistry
-from room.session import StreamHandler
+from room.llm_dispatcher import LLMDispatcher
+from room.registry import HandlerRegistry, serialize_event
+from room.session import _DRAIN_TIMEOUT, StreamHandler
 from room.store import MemoryStore
 
 logger = logging.getLogger(__name__)
 
+# One HTTP/2 connection multiplexes every LLM call. Keepalive pings only
+# run while calls are open (no keepalive_permit_without_calls), so an idle
+# connection between mentions is not pinged
+_CHAT_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    # Fail a dead connection instead of leaving open LLM calls hanging on it
+    ("grpc.keepalive_timeout_ms", 10000),
+    # Don't stop pinging an open call that has gone quiet (e.g. a model
+    # still thinking); by default pings stop after two with no data sent
+    ("grpc.http2.max_pings_without_data", 0),
+    # Concurrent LLM streams share the connection window; let BDP probing
+    # grow it rather than stall replies on WINDOW_UPDATE round trips
+    ("grpc.http2.bdp_probe", 1),
+    # Allow the Chat service to send larger DATA frames
+    ("grpc.http2.max_frame_size", 1 << 20),
+]
+
 
 class RoomService(room_pb2_grpc.RoomServicer):
     def __init__(self, store: MemoryStore, config: AppConfig) -> None:
         self._store = store
         self._config = config
         self._registry = HandlerRegistry()
+        # Shared by all sessions instead of a channel per LLM call
+        self._chat_channel = grpc.aio.insecure_channel(
+            config.chat_service.address,
+            options=_CHAT_CHANNEL_OPTIONS,
+        )
+        self._llm_dispatcher = LLMDispatcher(
+            chat_channel=self._chat_channel,
+            store=store,
+            registry=self._registry,
+            chunk_flush_interval=config.chat_service.chunk_flush_interval_ms / 1000,
+            chunk_flush_chars=config.chat_service.chunk_flush_chars,
+        )
+
+    async def drain(self, timeout: float) -> None:
+        """Let in-flight LLM replies finish, then close every session stream.
+
+        Each stream flushes its queued events before ending, so clients get
+        complete replies instead of a connection reset. All streams are
+        closed within ``timeout`` seconds: the flush budget is reserved out
+        of it, so the server's grace period doesn't cancel them mid-flush.
+        """
+        await self._llm_dispatcher.wait_idle(max(0.0, timeout - _DRAIN_TIMEOUT))
+        self._registry.close_all()
+
+    async def close(self) -> None:
+        """Stop in-flight LLM calls and release the chat service channel."""
+        await self._llm_dispatcher.cancel_pending_tasks()
+        await self._chat_channel.close()
 
     # ------------------------------------------------------------------
     # Unary RPCs
@@ -61,12 +107,7 @@ class RoomService(room_pb2_grpc.RoomServicer):
         online_ids = self._registry.get_online_user_ids(request.room_id)
         all_participants = await self._store.get_participants(request.room_id)
         online_participants = [
-            room_pb2.Participant(
-                id=p.user_id,
-                name=p.display_name,
-                role=p.role,
-                type=room_pb2.HUMAN,
-            )
+            self._store.participant_to_proto(p, is_online=True)
             for p in all_participants
             if p.user_id in online_ids
         ]
@@ -111,14 +152,14 @@ class RoomService(room_pb2_grpc.RoomServicer):
         limit = request.limit or 50
         cursor = request.cursor if request.HasField("cursor") else None
 
-        messages, next_cursor = await self._store.load_history(
+        messages, next_cursor = await self._store.load_history_proto(
             room_id=request.room_id,
             limit=limit,
             cursor=cursor,
         )
 
         return room_pb2.LoadHistoryResponse(
-            messages=[self._store.message_to_proto(m) for m in messages],
+            messages=messages,
             next_cursor=next_cursor,
         )
 
@@ -135,6 +176,46 @@ class RoomService(room_pb2_grpc.RoomServicer):
             context=context,
             store=self._store,
             registry=self._registry,
-            chat_service_address=self._config.chat_service.address,
+            llm_dispatcher=self._llm_dispatcher,
         )
         await handler.run(request_iterator)
+
+
+def add_room_servicer_to_server(servicer: RoomService, server: grpc.aio.Server) -> None:
+    """Register the servicer, mirroring the generated add_RoomServicer_to_server.
+
+    The only difference is the RoomSession response serializer, which also
+    accepts CachedEvent so broadcasts are encoded once for all recipients.
+    """
+    rpc_method_handlers = {
+        "CreateRoom": grpc.unary_unary_rpc_method_handler(
+            servicer.CreateRoom,
+            request_deserializer=room_pb2.CreateRoomRequest.FromString,
+            response_serializer=room_pb2.CreateRoomResponse.SerializeToString,
+        ),
+        "GetRoom": grpc.unary_unary_rpc_method_handler(
+            servicer.GetRoom,
+            request_deserializer=room_pb2.GetRoomRequest.FromString,
+            response_serializer=room_pb2.GetRoomResponse.SerializeToString,
+        ),
+        "ListRooms": grpc.unary_unary_rpc_method_handler(
+            servicer.ListRooms,
+            request_deserializer=room_pb2.ListRoomsRequest.FromString,
+            response_serializer=room_pb2.ListRoomsResponse.SerializeToString,
+        ),
+        "LoadHistory": grpc.unary_unary_rpc_method_handler(
+            servicer.LoadHistory,
+            request_deserializer=room_pb2.LoadHistoryRequest.FromString,
+            response_serializer=room_pb2.LoadHistoryResponse.SerializeToString,
+        ),
+        "RoomSession": grpc.stream_stream_rpc_method_handler(
+            servicer.RoomSession,
+            request_deserializer=room_pb2.ClientMessage.FromString,
+            response_serializer=serialize_event,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        "api.room.Room", rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers("api.room.Room", rpc_method_handlers)
@@ -8,20 +8,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
 
 import grpc
 
 from pb.api.room import room_pb2
 
-from room.llm_dispatcher import LLMDispatcher
-
 if TYPE_CHECKING:
-    from room.registry import HandlerRegistry
-    from room.store import MemoryStore
+    from room.llm_dispatcher import LLMDispatcher
+    from room.registry import HandlerRegistry, OutboundEvent
+    from room.store import MemoryStore, StoredRoom
 
 logger = logging.getLogger(__name__)
 
+# Seconds to keep flushing queued events after the client stops sending
+_DRAIN_TIMEOUT = 1.0
+
 
 class StreamHandler:
     """Handler for a single user's room session stream.
@@ -37,23 +39,41 @@ class StreamHandler:
         context: grpc.aio.ServicerContext,
         store: "MemoryStore",
         registry: "HandlerRegistry",
-        chat_service_address: str,
+        llm_dispatcher: "LLMDispatcher",
     ) -> None:
         self._context = context
         self._store = store
         self._registry = registry
-        self._outbound: asyncio.Queue[room_pb2.ServerEvent] = asyncio.Queue()
+        # None is the close sentinel for _write_loop
+        self._outbound: asyncio.Queue[Optional[OutboundEvent]] = asyncio.Queue()
+        self._reader: Optional[asyncio.Task] = None
         self._room_id: Optional[str] = None
         self._user_id: Optional[str] = None
         self._display_name: Optional[str] = None
         self._role: room_pb2.Role.ValueType = room_pb2.ROLE_UNSPECIFIED
-
-        # LLM dispatch is handled by a separate class
-        self._llm_dispatcher = LLMDispatcher(
-            chat_service_address=chat_service_address,
-            store=store,
-            registry=registry,
-        )
+        # Room fetched at join. MemoryStore hands out the live StoredRoom, so
+        # LLM/description changes from any session are visible through it; a
+        # store that returns copies must refresh this on those updates.
+        self._room: Optional["StoredRoom"] = None
+
+        # LLM dispatch is handled by a separate class, shared across sessions
+        self._llm_dispatcher = llm_dispatcher
+
+        # ClientMessage payload name → handler, so dispatch is one dict
+        # lookup instead of walking an if/elif chain per message.
+        self._payload_handlers: dict[str, Callable[[Any], Awaitable[None]]] = {
+            "join": self._handle_join,
+            "message": self._handle_message,
+            "typing": self._handle_typing,
+            "interrupt": self._handle_interrupt,
+            "add_llm": self._handle_add_llm,
+            "update_llm": self._handle_update_llm,
+            "remove_llm": self._handle_remove_llm,
+            "update_room_description": self._handle_update_room_description,
+            "create_poll": self._handle_create_poll,
+            "cast_vote": self._handle_cast_vote,
+            "close_poll": self._handle_close_poll,
+        }
 
     @property
     def user_id(self) -> Optional[str]:
@@ -63,61 +83,70 @@ class StreamHandler:
     def room_id(self) -> Optional[str]:
         return self._room_id
 
-    async def enqueue(self, event: room_pb2.ServerEvent) -> None:
-        await self._outbound.put(event)
+    def enqueue_nowait(self, event: OutboundEvent) -> None:
+        # The outbound queue is unbounded, so there is nothing to wait for
+        self._outbound.put_nowait(event)
 
     async def run(
         self,
         request_iterator,
     ) -> None:
         """Main loop: read from client + flush outbound queue concurrently."""
-
-        async def _write_loop() -> None:
-            while True:
-                event = await self._outbound.get()
-                await self._context.write(event)
-
-        write_task = asyncio.create_task(_write_loop())
-
+        try:
+            async with asyncio.TaskGroup() as tg:
+                writer = tg.create_task(self._write_loop())
+                self._reader = tg.create_task(self._read_loop(request_iterator))
+                await asyncio.wait({self._reader})
+                # Client closed its side (or we are shutting down): flush
+                # what is queued, but don't hold the stream open
+                # indefinitely for a slow reader
+                done, _ = await asyncio.wait({writer}, timeout=_DRAIN_TIMEOUT)
+                if not done:
+                    writer.cancel()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._room_id and self._user_id:
+                self._registry.unregister(self._room_id, self._user_id, self)
+                await self._broadcast_user_left()
+                # LLM replies are for whoever is still in the room; only stop
+                # them once nobody is left to receive them
+                if not self._registry.get_online_user_ids(self._room_id):
+                    await self._llm_dispatcher.cancel_room_tasks(self._room_id)
+
+    def close(self) -> None:
+        """Stop reading from the client and end the stream once flushed.
+
+        Used on server shutdown so sessions finish cleanly within the grace
+        period instead of being cut off mid-write.
+        """
+        if self._reader is not None:
+            self._reader.cancel()
+
+    async def _read_loop(self, request_iterator) -> None:
+        payload_handlers = self._payload_handlers
         try:
             async for client_msg in request_iterator:
                 payload = client_msg.WhichOneof("payload")
-                if payload == "join":
-                    await self._handle_join(client_msg.join)
-                elif payload == "message":
-                    await self._handle_message(client_msg.message)
-                elif payload == "typing":
-                    await self._handle_typing(client_msg.typing)
-                elif payload == "interrupt":
-                    await self._handle_interrupt(client_msg.interrupt)
-                elif payload == "add_llm":
-                    await self._handle_add_llm(client_msg.add_llm)
-                elif payload == "update_llm":
-                    await self._handle_update_llm(client_msg.update_llm)
-                elif payload == "remove_llm":
-                    await self._handle_remove_llm(client_msg.remove_llm)
-                elif payload == "update_room_description":
-                    await self._handle_update_room_description(
-                        client_msg.update_room_description
-                    )
-                elif payload == "create_poll":
-                    await self._handle_create_poll(client_msg.create_poll)
-                elif payload == "cast_vote":
-                    await self._handle_cast_vote(client_msg.cast_vote)
-                elif payload == "close_poll":
-                    await self._handle_close_poll(client_msg.close_poll)
-                elif payload == "ping":
-                    await self.enqueue(
+                if payload == "ping":
+                    self.enqueue_nowait(
                         room_pb2.ServerEvent(pong=room_pb2.Pong())
                     )
+                    continue
+                handler = payload_handlers.get(payload)
+                if handler is not None:
+                    await handler(getattr(client_msg, payload))
         except asyncio.CancelledError:
+            # Only close() cancels the reader directly; when the whole RPC
+            # is cancelled the TaskGroup tears the writer down anyway
             pass
         finally:
-            write_task.cancel()
-            await self._llm_dispatcher.cancel_pending_tasks()
-            if self._room_id and self._user_id:
-                self._registry.unregister(self._room_id, self)
-                await self._broadcast_user_left()
+            # Writer exits once everything queued before this is sent
+            self._outbound.put_nowait(None)
+
+    async def _write_loop(self) -> None:
+        while (event := await self._outbound.get()) is not None:
+            await self._context.write(event)
 
     # ------------------------------------------------------------------
     # Client message handlers
@@ -131,7 +160,7 @@ class StreamHandler:
 
         room = await self._store.get_room(join.room_id)
         if room is None:
-            await self.enqueue(
+            self.enqueue_nowait(
                 room_pb2.ServerEvent(
                     error=room_pb2.Error(
                         code="ROOM_NOT_FOUND",
@@ -140,9 +169,10 @@ class StreamHandler:
                 )
             )
             return
+        self._room = room
 
         # Persist participant
-        await self._store.add_participant(
+        participant = await self._store.add_participant(
             room_id=join.room_id,
             user_id=join.user_id,
             display_name=join.display_name,
@@ -152,53 +182,37 @@ class StreamHandler:
         )
 
         # Register handler for broadcasts
-        self._registry.register(join.room_id, self)
+        self._registry.register(join.room_id, join.user_id, self)
 
-        # Build room state
-        messages, _ = await self._store.load_history(join.room_id, limit=50)
-        online_ids = self._registry.get_online_user_ids(join.room_id)
+        # Build room state. Plain awaits on the in-memory store never
+        # suspend, so room_state is queued before any broadcast can reach
+        # this now-registered handler
+        messages, _ = await self._store.load_history_proto(join.room_id, limit=50)
         all_participants = await self._store.get_participants(join.room_id)
+        active_polls = await self._store.list_room_polls(join.room_id, active_only=True)
+        online_ids = self._registry.get_online_user_ids(join.room_id)
 
         # All human participants with online status
         all_participants_proto = [
-            room_pb2.Participant(
-                id=p.user_id,
-                name=p.display_name,
-                role=p.role,
-                type=room_pb2.HUMAN,
-                title=p.title,
-                is_online=p.user_id in online_ids,
-                avatar=p.avatar,
-            )
+            self._store.participant_to_proto(p, p.user_id in online_ids)
             for p in all_participants
         ]
 
-        # Load active polls
-        active_polls = await self._store.list_room_polls(join.room_id, active_only=True)
-
         room_state = room_pb2.RoomState(
             room=self._store.room_to_proto(room),
             participants=all_participants_proto,
-            messages=[self._store.message_to_proto(m) for m in messages],
+            messages=messages,
             polls=[self._store.poll_to_proto(p) for p in active_polls],
         )
-        await self.enqueue(room_pb2.ServerEvent(room_state=room_state))
+        self.enqueue_nowait(room_pb2.ServerEvent(room_state=room_state))
 
         # Notify others
+        event = room_pb2.ServerEvent()
+        event.user_joined.user.CopyFrom(
+            self._store.participant_to_proto(participant, is_online=True)
+        )
         await self._registry.broadcast_except(
-            join.room_id,
-            room_pb2.ServerEvent(
-                user_joined=room_pb2.UserJoined(
-                    user=room_pb2.Participant(
-                        id=join.user_id,
-                        name=join.display_name,
-                        role=join.role,
-                        type=room_pb2.HUMAN,
-                        title=join.title,
-                    )
-                )
-            ),
-            exclude_user_id=join.user_id,
+            join.room_id, event, exclude_user_id=join.user_id
         )
         logger.info(
             "User %s (%s) joined room %s",
@@ -222,38 +236,32 @@ class StreamHandler:
         )
 
         # Broadcast to all participants
-        msg_proto = self._store.message_to_proto(stored)
-        await self._registry.broadcast(
-            self._room_id,
-            room_pb2.ServerEvent(
-                message_received=room_pb2.MessageReceived(message=msg_proto)
-            ),
-        )
+        event = room_pb2.ServerEvent()
+        event.message_received.message.CopyFrom(self._store.message_to_proto(stored))
+        await self._registry.broadcast(self._room_id, event)
 
         # Check for @mentions
-        room = await self._store.get_room(self._room_id)
-        if room:
+        if self._room:
             await self._llm_dispatcher.dispatch_mentions(
                 room_id=self._room_id,
                 content=send.content,
                 client_mentions=list(send.mentions),
                 trigger_msg_id=stored.message_id,
-                room=room,
+                room=self._room,
             )
 
     async def _handle_typing(self, typing: room_pb2.TypingIndicator) -> None:
         if not self._room_id or not self._user_id:
             return
+        # Fill the nested message in place: one allocation instead of
+        # building a UserTyping and merging it into the ServerEvent
+        event = room_pb2.ServerEvent()
+        user_typing = event.user_typing
+        user_typing.user_id = self._user_id
+        user_typing.user_name = self._display_name or ""
+        user_typing.is_typing = typing.is_typing
         await self._registry.broadcast_except(
-            self._room_id,
-            room_pb2.ServerEvent(
-                user_typing=room_pb2.UserTyping(
-                    user_id=self._user_id,
-                    user_name=self._display_name or "",
-                    is_typing=typing.is_typing,
-                )
-            ),
-            exclude_user_id=self._user_id,
+            self._room_id, event, exclude_user_id=self._user_id
         )
 
     async def _handle_add_llm(self, add: room_pb2.AddLLM) -> None:
@@ -313,6 +321,7 @@ class StreamHandler:
             self._room_id, update.description
         )
         if room:
+            self._room = room
             await self._registry.broadcast(
                 self._room_id,
                 room_pb2.ServerEvent(
@@ -341,7 +350,7 @@ class StreamHandler:
 
         options = [(opt.text, opt.description) for opt in create.options]
         if len(options) < 2:
-            await self.enqueue(
+            self.enqueue_nowait(
                 room_pb2.ServerEvent(
                     error=room_pb2.Error(
                         code="INVALID_POLL",
@@ -375,13 +384,9 @@ class StreamHandler:
         )
 
         # Broadcast the poll message (includes poll_id for frontend rendering)
-        msg_proto = self._store.message_to_proto(poll_msg)
-        await self._registry.broadcast(
-            self._room_id,
-            room_pb2.ServerEvent(
-                message_received=room_pb2.MessageReceived(message=msg_proto)
-            ),
-        )
+        event = room_pb2.ServerEvent()
+        event.message_received.message.CopyFrom(self._store.message_to_proto(poll_msg))
+        await self._registry.broadcast(self._room_id, event)
 
         # Also broadcast poll_created so frontend can update poll state
         await self._registry.broadcast(
@@ -412,33 +417,31 @@ class StreamHandler:
         if not self._room_id or not self._user_id:
             return
 
-        # Vote on each selected option
-        for option_id in vote.option_ids:
-            result = await self._store.add_vote(
-                poll_id=vote.poll_id,
-                option_id=option_id,
-                voter_id=self._user_id,
-                voter_name=self._display_name or "Unknown",
-                reason=vote.reason,
+        # Vote on all selected options in one store call
+        results = await self._store.add_votes(
+            poll_id=vote.poll_id,
+            option_ids=list(vote.option_ids),
+            voter_id=self._user_id,
+            voter_name=self._display_name or "Unknown",
+            reason=vote.reason,
+        )
+        for poll, option, stored_vote in results:
+            await self._registry.broadcast(
+                self._room_id,
+                room_pb2.ServerEvent(
+                    poll_voted=room_pb2.PollVoted(
+                        poll_id=poll.poll_id,
+                        option_id=option.id,
+                        vote=self._store.poll_vote_to_proto(stored_vote),
+                    )
+                ),
+            )
+            logger.info(
+                "Vote cast on poll %s option %s by %s",
+                vote.poll_id,
+                option.id,
+                self._user_id,
             )
-            if result:
-                poll, option, stored_vote = result
-                await self._registry.broadcast(
-                    self._room_id,
-                    room_pb2.ServerEvent(
-                        poll_voted=room_pb2.PollVoted(
-                            poll_id=poll.poll_id,
-                            option_id=option.id,
-                            vote=self._store.poll_vote_to_proto(stored_vote),
-                        )
-                    ),
-                )
-                logger.info(
-                    "Vote cast on poll %s option %s by %s",
-                    vote.poll_id,
-                    option_id,
-                    self._user_id,
-                )
 
     async def _handle_close_poll(self, close: room_pb2.ClosePoll) -> None:
         if not self._room_id or not self._user_id:
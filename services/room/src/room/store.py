@@ -6,28 +6,55 @@ Interface is async so the DynamoDB implementation can be swapped in later.
 
 from __future__ import annotations
 
-import uuid
+import itertools
+import re
+import time
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from operator import attrgetter
+from secrets import token_hex
 from typing import Optional
 
 from google.protobuf.timestamp_pb2 import Timestamp
 
 from pb.api.room import room_pb2
+from pb.shared import content_pb2
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredRoom:
     room_id: str
     name: str
-    created_at: datetime
+    created_at_ms: int  # epoch milliseconds, like every stored time
     created_by: str
-    llms: list[room_pb2.LLMConfig]
+    llms: dict[str, room_pb2.LLMConfig]  # llm id → config, in insertion order
     description: str = ""
     visibility: room_pb2.RoomVisibility.ValueType = room_pb2.ROOM_VISIBILITY_PUBLIC
-
-
-@dataclass
+    # Lookups derived from `llms` for mention matching, built lazily by the
+    # LLM dispatcher. None means stale; call llms_changed() after mutating.
+    llm_lookup: Optional[dict[str, room_pb2.LLMConfig]] = field(
+        default=None, repr=False, compare=False
+    )
+    llm_name_lookup: Optional[dict[str, room_pb2.LLMConfig]] = field(
+        default=None, repr=False, compare=False
+    )
+    mention_re: Optional[re.Pattern[str]] = field(
+        default=None, repr=False, compare=False
+    )
+    # RoomInfo built by room_to_proto; None means stale
+    info_proto: Optional[room_pb2.RoomInfo] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def llms_changed(self) -> None:
+        """Drop caches derived from `llms`."""
+        self.llm_lookup = None
+        self.llm_name_lookup = None
+        self.mention_re = None
+        self.info_proto = None
+
+
+@dataclass(slots=True)
 class StoredMessage:
     message_id: str
     room_id: str
@@ -36,40 +63,58 @@ class StoredMessage:
     sender_type: room_pb2.ParticipantType.ValueType
     content: str
     reply_to: Optional[str]
-    timestamp: datetime
+    timestamp_ms: int
     # sort key for cursor pagination (matches DynamoDB SK format)
     sort_key: str
     poll_id: Optional[str] = None  # If set, this message is a poll
-
-
-@dataclass
+    # Chat-service forms of this message, built on first use by the LLM
+    # dispatcher: as seen by other participants, and by the LLM that sent it
+    chat_message: Optional[content_pb2.Message] = field(
+        default=None, repr=False, compare=False
+    )
+    chat_reply: Optional[content_pb2.Message] = field(
+        default=None, repr=False, compare=False
+    )
+    # room_pb2.Message, built by add_message via message_to_proto
+    proto: Optional[room_pb2.Message] = field(
+        default=None, repr=False, compare=False
+    )
+
+
+@dataclass(slots=True)
 class StoredParticipant:
     user_id: str
     room_id: str
     display_name: str
     role: room_pb2.Role.ValueType
-    joined_at: datetime
+    joined_at_ms: int
     title: str = ""
     avatar: str = ""  # emoji avatar
+    # Participant protos built by participant_to_proto, indexed by is_online;
+    # None means stale
+    protos: Optional[list[Optional[room_pb2.Participant]]] = field(
+        default=None, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredPollVote:
     voter_id: str
     voter_name: str
     reason: str
-    voted_at: datetime
+    voted_at_ms: int
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredPollOption:
     id: str
     text: str
     description: str
-    votes: list[StoredPollVote] = field(default_factory=list)
+    # voter_id → vote, in the order votes were cast
+    votes: dict[str, StoredPollVote] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredPoll:
     poll_id: str
     room_id: str
@@ -81,39 +126,87 @@ class StoredPoll:
     allow_multiple: bool
     anonymous: bool
     status: room_pb2.PollStatus.ValueType
-    created_at: datetime
-    closed_at: Optional[datetime] = None
+    created_at_ms: int
+    closed_at_ms: Optional[int] = None
     mandatory: bool = False  # If true, LLMs must vote
+    # voter_id → option holding their vote (single-choice polls only)
+    voter_option: dict[str, StoredPollOption] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    # created_at as a proto, built once; constructors copy it
+    created_at_ts: Optional[Timestamp] = field(
+        default=None, repr=False, compare=False
+    )
+
+
+# Enum values bound once for the per-call checks below
+_ROOM_PRIVATE: int = room_pb2.ROOM_VISIBILITY_PRIVATE
+_POLL_OPEN: int = room_pb2.POLL_OPEN
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _ms_to_ts(ms: int) -> Timestamp:
+    # Plain integer split; FromDatetime goes through datetime arithmetic
+    seconds, millis = divmod(ms, 1000)
+    return Timestamp(seconds=seconds, nanos=millis * 1_000_000)
+
+
+# Message ids: a random per-process prefix plus a counter. Unique across
+# restarts and replicas without an RNG call per message. Ids increase in the
+# order they are drawn, not stored: an LLM reply takes its id when the call
+# starts, so within one millisecond sort keys can disagree with append order.
+_MESSAGE_ID_PREFIX = token_hex(4)
+_message_counter = itertools.count()
 
 
-def _now() -> datetime:
-    return datetime.now(timezone.utc)
+def new_message_id() -> str:
+    """Return a fresh 16-hex-char message id."""
+    return f"{_MESSAGE_ID_PREFIX}{next(_message_counter) & 0xFFFFFFFF:08x}"
 
 
-def _dt_to_ts(dt: datetime) -> Timestamp:
-    ts = Timestamp()
-    ts.FromDatetime(dt)
-    return ts
+_sort_key_of = attrgetter("sort_key")
 
 
-def _make_sort_key(dt: datetime, msg_id: str) -> str:
-    epoch_ms = int(dt.timestamp() * 1000)
+def _make_sort_key(epoch_ms: int, msg_id: str) -> str:
     return f"MSG#{epoch_ms}#{msg_id}"
 
 
 class MemoryStore:
+    """In-process store for rooms, messages, participants and polls.
+
+    Methods are async to match a networked backend, but none of them awaits,
+    so each call runs to completion on the event loop without interleaving.
+    That makes every method atomic without locks; keep it that way rather
+    than adding awaits inside a method. Returned lists are fresh copies.
+    """
+
     def __init__(self) -> None:
         self._rooms: dict[str, StoredRoom] = {}
+        # room_ids in creation order, and each one's index in that list,
+        # so a list_rooms cursor resolves without scanning
+        self._room_order: list[str] = []
+        self._room_pos: dict[str, int] = {}
+        # Room listings, partitioned by visibility when rooms are created or
+        # joined so list_rooms never filters. Both hold sorted _room_order
+        # positions. Private rooms are only listed for their creator.
+        self._public_rooms: list[int] = []
         # room_id → list of messages (append-only, sorted by time)
         self._messages: dict[str, list[StoredMessage]] = {}
-        # (room_id, user_id) → participant
-        self._participants: dict[tuple[str, str], StoredParticipant] = {}
-        # user_id → set of room_ids
-        self._user_rooms: dict[str, set[str]] = {}
+        # room_id → sort_key → index in _messages, for cursor lookups
+        self._message_pos: dict[str, dict[str, int]] = {}
+        # room_id → user_id → participant
+        self._room_participants: dict[str, dict[str, StoredParticipant]] = {}
+        # user_id → rooms they joined and may see listed
+        self._user_rooms: dict[str, list[int]] = {}
         # poll_id → poll
         self._polls: dict[str, StoredPoll] = {}
         # room_id → list of poll_ids (chronological)
         self._room_polls: dict[str, list[str]] = {}
+        # room_id → poll_id → poll, open polls only (chronological)
+        self._room_open_polls: dict[str, dict[str, StoredPoll]] = {}
 
     async def create_room(
         self,
@@ -123,17 +216,22 @@ class MemoryStore:
         description: str = "",
         visibility: room_pb2.RoomVisibility.ValueType = room_pb2.ROOM_VISIBILITY_PUBLIC,
     ) -> str:
-        room_id = uuid.uuid4().hex[:12]
+        room_id = token_hex(6)
         self._rooms[room_id] = StoredRoom(
             room_id=room_id,
             name=name,
-            created_at=_now(),
+            created_at_ms=_now_ms(),
             created_by=created_by,
-            llms=list(llms),
+            llms={llm.id: llm for llm in llms},
             description=description,
             visibility=visibility,
         )
+        self._room_pos[room_id] = len(self._room_order)
+        if visibility != _ROOM_PRIVATE:
+            self._public_rooms.append(len(self._room_order))
+        self._room_order.append(room_id)
         self._messages[room_id] = []
+        self._message_pos[room_id] = {}
         return room_id
 
     async def get_room(self, room_id: str) -> Optional[StoredRoom]:
@@ -145,32 +243,21 @@ class MemoryStore:
         limit: int = 20,
         cursor: Optional[str] = None,
     ) -> tuple[list[StoredRoom], Optional[str]]:
-        if user_id:
-            room_ids = self._user_rooms.get(user_id, set())
-            rooms = [self._rooms[rid] for rid in room_ids if rid in self._rooms]
-        else:
-            rooms = list(self._rooms.values())
-
-        # Filter out private rooms that don't belong to the requesting user
-        # Private rooms are only visible to their creator (in room list)
-        rooms = [
-            r
-            for r in rooms
-            if r.visibility != room_pb2.ROOM_VISIBILITY_PRIVATE
-            or r.created_by == user_id
+        # Creation order is time order, so newest-first is reverse position.
+        # cursor is a room_id; the page continues with rooms older than it.
+        room_pos = self._room_pos
+        end = len(self._room_order)
+        if cursor and cursor in room_pos:
+            end = room_pos[cursor]
+
+        visible = self._user_rooms.get(user_id, []) if user_id else self._public_rooms
+        stop = bisect_left(visible, end)
+        rooms, order = self._rooms, self._room_order
+        page = [
+            rooms[order[visible[i]]]
+            for i in range(stop - 1, max(stop - limit, 0) - 1, -1)
         ]
 
-        rooms.sort(key=lambda r: r.created_at, reverse=True)
-
-        # cursor is a room_id; skip until we find it
-        start = 0
-        if cursor:
-            for i, r in enumerate(rooms):
-                if r.room_id == cursor:
-                    start = i + 1
-                    break
-
-        page = rooms[start : start + limit]
         next_cursor = page[-1].room_id if len(page) == limit else None
         return page, next_cursor
 
@@ -183,25 +270,31 @@ class MemoryStore:
         title: str = "",
         avatar: str = "",
     ) -> StoredParticipant:
-        key = (room_id, user_id)
-        if key in self._participants:
+        roster = self._room_participants.setdefault(room_id, {})
+        participant = roster.get(user_id)
+        if participant is not None:
             # Update display name on rejoin
-            self._participants[key].display_name = display_name
-            self._participants[key].role = role
-            self._participants[key].title = title
-            self._participants[key].avatar = avatar
+            participant.display_name = display_name
+            participant.role = role
+            participant.title = title
+            participant.avatar = avatar
+            participant.protos = None
         else:
-            self._participants[key] = StoredParticipant(
+            participant = roster[user_id] = StoredParticipant(
                 user_id=user_id,
                 room_id=room_id,
                 display_name=display_name,
                 role=role,
-                joined_at=_now(),
+                joined_at_ms=_now_ms(),
                 title=title,
                 avatar=avatar,
             )
-            self._user_rooms.setdefault(user_id, set()).add(room_id)
-        return self._participants[key]
+            room = self._rooms.get(room_id)
+            if room is not None and (
+                room.visibility != _ROOM_PRIVATE or room.created_by == user_id
+            ):
+                insort(self._user_rooms.setdefault(user_id, []), self._room_pos[room_id])
+        return participant
 
     async def update_room_description(
         self, room_id: str, description: str
@@ -211,6 +304,7 @@ class MemoryStore:
         if not room:
             return None
         room.description = description
+        room.info_proto = None
         return room
 
     async def add_llm(self, room_id: str, llm: room_pb2.LLMConfig) -> bool:
@@ -219,9 +313,10 @@ class MemoryStore:
         if not room:
             return False
         # Avoid duplicates
-        if any(l.id == llm.id for l in room.llms):
+        if llm.id in room.llms:
             return False
-        room.llms.append(llm)
+        room.llms[llm.id] = llm
+        room.llms_changed()
         return True
 
     async def update_llm(
@@ -239,36 +334,36 @@ class MemoryStore:
         room = self._rooms.get(room_id)
         if not room:
             return None
-        for llm in room.llms:
-            if llm.id == llm_id:
-                if model is not None:
-                    llm.model = model
-                if persona is not None:
-                    llm.persona = persona
-                if display_name is not None:
-                    llm.display_name = display_name
-                if title is not None:
-                    llm.title = title
-                if chat_style is not None:
-                    llm.chat_style = chat_style
-                if avatar is not None:
-                    llm.avatar = avatar
-                return llm
-        return None
+        llm = room.llms.get(llm_id)
+        if llm is None:
+            return None
+        if model is not None:
+            llm.model = model
+        if persona is not None:
+            llm.persona = persona
+        if display_name is not None:
+            llm.display_name = display_name
+        if title is not None:
+            llm.title = title
+        if chat_style is not None:
+            llm.chat_style = chat_style
+        if avatar is not None:
+            llm.avatar = avatar
+        room.llms_changed()
+        return llm
 
     async def remove_llm(self, room_id: str, llm_id: str) -> bool:
         """Remove an LLM from a room. Returns True if removed."""
         room = self._rooms.get(room_id)
         if not room:
             return False
-        original_len = len(room.llms)
-        room.llms = [l for l in room.llms if l.id != llm_id]
-        return len(room.llms) < original_len
+        if room.llms.pop(llm_id, None) is None:
+            return False
+        room.llms_changed()
+        return True
 
     async def get_participants(self, room_id: str) -> list[StoredParticipant]:
-        return [
-            p for (rid, _), p in self._participants.items() if rid == room_id
-        ]
+        return list(self._room_participants.get(room_id, {}).values())
 
     async def add_message(
         self,
@@ -281,8 +376,8 @@ class MemoryStore:
         poll_id: Optional[str] = None,
         message_id: Optional[str] = None,
     ) -> StoredMessage:
-        msg_id = message_id or uuid.uuid4().hex[:16]
-        now = _now()
+        msg_id = message_id or new_message_id()
+        epoch_ms = _now_ms()
         msg = StoredMessage(
             message_id=msg_id,
             room_id=room_id,
@@ -291,11 +386,16 @@ class MemoryStore:
             sender_type=sender_type,
             content=content,
             reply_to=reply_to,
-            timestamp=now,
-            sort_key=_make_sort_key(now, msg_id),
+            timestamp_ms=epoch_ms,
+            sort_key=_make_sort_key(epoch_ms, msg_id),
             poll_id=poll_id,
         )
-        self._messages.setdefault(room_id, []).append(msg)
+        # Every new message is broadcast right away, so build its wire form
+        # now, while the fields are at hand
+        self.message_to_proto(msg)
+        msgs = self._messages.setdefault(room_id, [])
+        self._message_pos.setdefault(room_id, {})[msg.sort_key] = len(msgs)
+        msgs.append(msg)
         return msg
 
     async def load_history(
@@ -309,40 +409,89 @@ class MemoryStore:
         # cursor is a sort_key; find position and go backward
         end = len(msgs)
         if cursor:
-            for i, m in enumerate(msgs):
-                if m.sort_key == cursor:
-                    end = i
-                    break
+            pos = self._message_pos.get(room_id, {}).get(cursor)
+            if pos is None:
+                # Not one of ours (e.g. "MSG#<epoch_ms>" to page back from a
+                # point in time). Append order is sort_key order up to
+                # same-millisecond ties, so bisect to the first message at
+                # or after it
+                pos = bisect_left(msgs, cursor, key=_sort_key_of)
+            end = pos
 
         start = max(0, end - limit)
         page = msgs[start:end]
         next_cursor = page[0].sort_key if start > 0 else None
         return page, next_cursor
 
+    async def load_history_proto(
+        self,
+        room_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[room_pb2.Message], Optional[str]]:
+        """load_history, converted to (read-only) protos for clients."""
+        page, next_cursor = await self.load_history(room_id, limit, cursor)
+        to_proto = self.message_to_proto
+        return [m.proto or to_proto(m) for m in page], next_cursor
+
     def message_to_proto(self, msg: StoredMessage) -> room_pb2.Message:
-        proto = room_pb2.Message(
-            message_id=msg.message_id,
-            sender_id=msg.sender_id,
-            sender_name=msg.sender_name,
-            sender_type=msg.sender_type,
-            content=msg.content,
-            reply_to=msg.reply_to,
-            timestamp=_dt_to_ts(msg.timestamp),
-        )
-        if msg.poll_id:
-            proto.poll_id = msg.poll_id
+        """Return the message's proto, built once since messages never change.
+
+        Callers must treat the result as read-only (copy it into responses).
+        """
+        if msg.proto is None:
+            # One constructor call: None leaves an optional field unset
+            msg.proto = room_pb2.Message(
+                message_id=msg.message_id,
+                sender_id=msg.sender_id,
+                sender_name=msg.sender_name,
+                sender_type=msg.sender_type,
+                content=msg.content,
+                reply_to=msg.reply_to,
+                timestamp=_ms_to_ts(msg.timestamp_ms),
+                poll_id=msg.poll_id or None,
+            )
+        return msg.proto
+
+    def participant_to_proto(
+        self, participant: StoredParticipant, is_online: bool
+    ) -> room_pb2.Participant:
+        """Return the participant's proto, cached per online state.
+
+        Callers must treat the result as read-only (copy it into responses).
+        """
+        protos = participant.protos
+        if protos is None:
+            protos = participant.protos = [None, None]
+        proto = protos[is_online]
+        if proto is None:
+            proto = protos[is_online] = room_pb2.Participant(
+                id=participant.user_id,
+                name=participant.display_name,
+                role=participant.role,
+                type=room_pb2.HUMAN,
+                title=participant.title,
+                is_online=is_online,
+                avatar=participant.avatar,
+            )
         return proto
 
     def room_to_proto(self, room: StoredRoom) -> room_pb2.RoomInfo:
-        return room_pb2.RoomInfo(
-            room_id=room.room_id,
-            name=room.name,
-            created_at=_dt_to_ts(room.created_at),
-            created_by=room.created_by,
-            llms=room.llms,
-            description=room.description,
-            visibility=room.visibility,
-        )
+        """Return the room's RoomInfo, built once and shared until the room changes.
+
+        Callers must treat the result as read-only (copy it into responses).
+        """
+        if room.info_proto is None:
+            room.info_proto = room_pb2.RoomInfo(
+                room_id=room.room_id,
+                name=room.name,
+                created_at=_ms_to_ts(room.created_at_ms),
+                created_by=room.created_by,
+                llms=room.llms.values(),
+                description=room.description,
+                visibility=room.visibility,
+            )
+        return room.info_proto
 
     # ------------------------------------------------------------------
     # Poll methods
@@ -360,13 +509,13 @@ class MemoryStore:
         anonymous: bool = False,
         mandatory: bool = False,
     ) -> StoredPoll:
-        poll_id = uuid.uuid4().hex[:12]
+        poll_id = token_hex(6)
         stored_options = [
             StoredPollOption(
-                id=uuid.uuid4().hex[:8],
+                id=token_hex(4),
                 text=text,
                 description=desc,
-                votes=[],
+                votes={},
             )
             for text, desc in options
         ]
@@ -381,11 +530,12 @@ class MemoryStore:
             allow_multiple=allow_multiple,
             anonymous=anonymous,
             status=room_pb2.POLL_OPEN,
-            created_at=_now(),
+            created_at_ms=_now_ms(),
             mandatory=mandatory,
         )
         self._polls[poll_id] = poll
         self._room_polls.setdefault(room_id, []).append(poll_id)
+        self._room_open_polls.setdefault(room_id, {})[poll_id] = poll
         return poll
 
     async def get_poll(self, poll_id: str) -> Optional[StoredPoll]:
@@ -394,11 +544,10 @@ class MemoryStore:
     async def list_room_polls(
         self, room_id: str, active_only: bool = True
     ) -> list[StoredPoll]:
-        poll_ids = self._room_polls.get(room_id, [])
-        polls = [self._polls[pid] for pid in poll_ids if pid in self._polls]
         if active_only:
-            polls = [p for p in polls if p.status == room_pb2.POLL_OPEN]
-        return polls
+            return list(self._room_open_polls.get(room_id, {}).values())
+        poll_ids = self._room_polls.get(room_id, [])
+        return [self._polls[pid] for pid in poll_ids if pid in self._polls]
 
     async def add_vote(
         self,
@@ -410,38 +559,75 @@ class MemoryStore:
     ) -> Optional[tuple[StoredPoll, StoredPollOption, StoredPollVote]]:
         """Add a vote. Returns (poll, option, vote) or None if not found."""
         poll = self._polls.get(poll_id)
-        if not poll or poll.status != room_pb2.POLL_OPEN:
+        if not poll or poll.status != _POLL_OPEN:
             return None
+        vote = self._cast_vote(poll, option_id, voter_id, voter_name, reason)
+        return (poll, *vote) if vote else None
+
+    async def add_votes(
+        self,
+        poll_id: str,
+        option_ids: list[str],
+        voter_id: str,
+        voter_name: str,
+        reason: str = "",
+    ) -> list[tuple[StoredPoll, StoredPollOption, StoredPollVote]]:
+        """Add a voter's votes for several options in one call.
 
+        Same semantics as calling add_vote per option, but the poll is
+        looked up and validated once. Returns only the votes that were cast.
+        """
+        poll = self._polls.get(poll_id)
+        if not poll or poll.status != _POLL_OPEN:
+            return []
+        results = []
+        for option_id in option_ids:
+            vote = self._cast_vote(poll, option_id, voter_id, voter_name, reason)
+            if vote:
+                results.append((poll, *vote))
+        return results
+
+    def _cast_vote(
+        self,
+        poll: StoredPoll,
+        option_id: str,
+        voter_id: str,
+        voter_name: str,
+        reason: str,
+    ) -> Optional[tuple[StoredPollOption, StoredPollVote]]:
         # Find option
         option = next((o for o in poll.options if o.id == option_id), None)
         if not option:
             return None
 
         # Check if already voted on this option
-        if any(v.voter_id == voter_id for v in option.votes):
+        if voter_id in option.votes:
             return None  # Already voted
 
-        # If not allow_multiple, remove any existing votes from this voter
+        # If not allow_multiple, remove the voter's previous vote; the index
+        # says which option holds it, so only that one is touched
         if not poll.allow_multiple:
-            for opt in poll.options:
-                opt.votes = [v for v in opt.votes if v.voter_id != voter_id]
+            previous = poll.voter_option.get(voter_id)
+            if previous is not None:
+                del previous.votes[voter_id]
+            poll.voter_option[voter_id] = option
 
         vote = StoredPollVote(
             voter_id=voter_id,
             voter_name=voter_name,
             reason=reason,
-            voted_at=_now(),
+            voted_at_ms=_now_ms(),
         )
-        option.votes.append(vote)
-        return poll, option, vote
+        option.votes[voter_id] = vote
+        return option, vote
 
     async def close_poll(self, poll_id: str) -> Optional[StoredPoll]:
         poll = self._polls.get(poll_id)
         if not poll:
             return None
         poll.status = room_pb2.POLL_CLOSED
-        poll.closed_at = _now()
+        poll.closed_at_ms = _now_ms()
+        self._room_open_polls.get(poll.room_id, {}).pop(poll_id, None)
         return poll
 
     def poll_vote_to_proto(self, vote: StoredPollVote) -> room_pb2.PollVote:
@@ -449,32 +635,49 @@ class MemoryStore:
             voter_id=vote.voter_id,
             voter_name=vote.voter_name,
             reason=vote.reason,
-            voted_at=_dt_to_ts(vote.voted_at),
-        )
-
-    def poll_option_to_proto(self, option: StoredPollOption) -> room_pb2.PollOption:
-        return room_pb2.PollOption(
-            id=option.id,
-            text=option.text,
-            description=option.description,
-            votes=[self.poll_vote_to_proto(v) for v in option.votes],
+            voted_at=_ms_to_ts(vote.voted_at_ms),
         )
 
     def poll_to_proto(self, poll: StoredPoll) -> room_pb2.Poll:
-        proto = room_pb2.Poll(
+        """Build a Poll in a single pass over its options and votes.
+
+        Options and votes are constructed inline with locally bound
+        constructors rather than through per-item helper calls; this runs
+        for every active poll on each join and LLM call.
+        """
+        PollOption = room_pb2.PollOption
+        PollVote = room_pb2.PollVote
+        ms_to_ts = _ms_to_ts
+        if poll.created_at_ts is None:
+            poll.created_at_ts = ms_to_ts(poll.created_at_ms)
+        return room_pb2.Poll(
             poll_id=poll.poll_id,
             room_id=poll.room_id,
             creator_id=poll.creator_id,
             creator_name=poll.creator_name,
             creator_type=poll.creator_type,
             question=poll.question,
-            options=[self.poll_option_to_proto(o) for o in poll.options],
+            options=[
+                PollOption(
+                    id=o.id,
+                    text=o.text,
+                    description=o.description,
+                    votes=[
+                        PollVote(
+                            voter_id=v.voter_id,
+                            voter_name=v.voter_name,
+                            reason=v.reason,
+                            voted_at=ms_to_ts(v.voted_at_ms),
+                        )
+                        for v in o.votes.values()
+                    ],
+                )
+                for o in poll.options
+            ],
             allow_multiple=poll.allow_multiple,
             anonymous=poll.anonymous,
             status=poll.status,
-            created_at=_dt_to_ts(poll.created_at),
+            created_at=poll.created_at_ts,
+            closed_at=ms_to_ts(poll.closed_at_ms) if poll.closed_at_ms else None,
             mandatory=poll.mandatory,
         )
-        if poll.closed_at:
-            proto.closed_at.CopyFrom(_dt_to_ts(poll.closed_at))
-        return proto